@@ -1,264 +1,463 @@
-import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import yfinance as yf
-import plotly.graph_objects as go
-
-# -----------------------
-# Load tickers
-# -----------------------
-def get_sp500_tickers():
-    try:
-        with open("sp500_tickers.txt", "r") as f:
-            tickers = [line.strip() for line in f if line.strip()]
-        return tickers
-    except Exception as e:
-        st.error(f"Error loading tickers: {e}")
-        return []
-
-# -----------------------
-# Technical Indicators
-# -----------------------
-def calculate_rsi(data, window=14):
-    delta = data["Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    data["RSI"] = 100 - (100 / (1 + rs))
-    return data
-
-def calculate_macd(data, short=12, long=26, signal=9):
-    short_ema = data["Close"].ewm(span=short, adjust=False).mean()
-    long_ema = data["Close"].ewm(span=long, adjust=False).mean()
-    data["MACD"] = short_ema - long_ema
-    data["Signal"] = data["MACD"].ewm(span=signal, adjust=False).mean()
-    return data
-
-def calculate_bollinger_bands(data, window=20, num_std=2):
-    rolling_mean = data["Close"].rolling(window=window).mean()
-    rolling_std = data["Close"].rolling(window=window).std()
-    data["BB_Upper"] = rolling_mean + (rolling_std * num_std)
-    data["BB_Lower"] = rolling_mean - (rolling_std * num_std)
-    return data
-
-def get_confluence_levels(hist, show_ma=True, show_bb=True):
-    levels = []
-    if show_ma:
-        levels += [hist["MA20"].iloc[-1], hist["MA50"].iloc[-1]]
-    if show_bb:
-        levels += [hist["BB_Upper"].iloc[-1], hist["BB_Lower"].iloc[-1]]
-    levels += [hist['Close'].max(), hist['Close'].min()]
-    levels = sorted(list(set([round(x, 2) for x in levels])))
-    return levels
-
-# -----------------------
-# Streamlit App
-# -----------------------
-st.set_page_config(page_title="S&P 500 Interactive Dashboard", layout="wide")
-st.sidebar.title("Navigation")
-page = st.sidebar.radio("Go to:", ["Dashboard", "Info"])
-
-# -----------------------
-# Information Page
-# -----------------------
-if page == "Info":
-    st.title("ℹ️ Dashboard Information")
-    st.markdown("""
-    Welcome to the S&P 500 Interactive Dashboard! This page explains all the tools and indicators used in the dashboard, with tips for beginners.  
-
-    ---
-    
-    ### **1. Moving Averages (MA20 & MA50)**
-    - **What it is:** The average closing price over 20 or 50 days.  
-    - **Purpose:** Identify trend direction and potential reversal points.  
-    - **Signals & Tips:**  
-        - Price above MA → bullish trend, below MA → bearish trend.  
-        - MA20 crossing MA50 → short/medium-term trend signal.  
-
-    ### **2. Bollinger Bands**
-    - **What it is:** Bands 2 standard deviations above/below MA20.  
-    - **Purpose:** Measure volatility; detect overbought/oversold.  
-    - **Signals & Tips:**  
-        - Price near upper band → overbought; lower band → oversold.  
-        - Narrow bands (squeeze) → low volatility, often precedes strong moves.  
-
-    ### **3. RSI (Relative Strength Index)**
-    - **What it is:** Momentum oscillator 0–100.  
-    - **Purpose:** Detect overbought (>70) or oversold (<30).  
-    - **Signals & Tips:**  
-        - RSI >70 → potential reversal down; RSI <30 → potential reversal up.  
-        - Divergence with price can indicate trend change.  
-
-    ### **4. MACD**
-    - **What it is:** Difference between 12-day & 26-day EMA; signal line = 9-day EMA of MACD.  
-    - **Purpose:** Identify trend and momentum.  
-    - **Signals & Tips:**  
-        - MACD crosses above Signal → bullish, below → bearish.  
-        - Use with volume and confluence for higher confidence.  
-
-    ### **5. Volume**
-    - **What it is:** Number of shares traded.  
-    - **Purpose:** Confirm strength of price moves.  
-    - **Signals & Tips:**  
-        - Rising volume confirms trend; spikes may indicate breakouts or reversals.  
-
-    ### **6. Confluence Levels**
-    - **What it is:** Price levels where multiple indicators align (MA, Bollinger Bands, highs/lows).  
-    - **Purpose:** Strong support/resistance zones.  
-    - **Signals & Tips:**  
-        - Price reaction likely near these levels; more indicators agreeing → stronger level.  
-
-    ### **7. CSV Download**
-    - **Purpose:** Export historical data for further analysis or backtesting.  
-
-    ---
-    
-    **General Tips for Beginners:**  
-    - Combine multiple indicators for confirmation.  
-    - Check trend on larger timeframes before trading short-term.  
-    - Zoom and interact with charts; toggle indicators to explore patterns.  
-    - Practice on historical data before live trades.
-    """)
-
-# -----------------------
-# Dashboard
-# -----------------------
-else:
-    st.title("📈 S&P 500 Interactive Dashboard")
-    tickers = get_sp500_tickers()
-    selected = st.selectbox("Select a company:", tickers if tickers else ["None"])
-
-    if selected != "None":
-        try:
-            ticker_symbol = selected.split("(")[-1].replace(")", "").strip()
-
-            # Date range
-            col1, col2 = st.columns(2)
-            with col1:
-                start_date = st.date_input("Start date", datetime.now() - timedelta(days=365))
-            with col2:
-                end_date = st.date_input("End date", datetime.now())
-
-            st.write(f"Fetching historical data for: {ticker_symbol}")
-            hist = yf.download(ticker_symbol, start=start_date, end=end_date).dropna()
-            hist.columns = hist.columns.get_level_values(0)
-
-            # Filter data based on selected range
-            filtered_hist = hist.loc[start_date:end_date]
-
-            if filtered_hist.empty:
-                st.warning("No historical data available for this ticker in the selected date range.")
-            else:
-                st.subheader(selected)
-
-                # ------------------- Last N Days Table -------------------
-                n_days = 10
-                last_n_days = filtered_hist.tail(n_days)
-                st.write(f"### Last {min(n_days, len(filtered_hist))} Days of Historical Prices")
-                st.dataframe(last_n_days)
-
-                # Sidebar indicators
-                st.sidebar.header("Chart Options")
-                show_ma = st.sidebar.checkbox("Show Moving Averages (MA20 & MA50)", value=True)
-                show_bb = st.sidebar.checkbox("Show Bollinger Bands", value=True)
-                show_rsi = st.sidebar.checkbox("Show RSI", value=True)
-                show_macd = st.sidebar.checkbox("Show MACD", value=True)
-                show_volume = st.sidebar.checkbox("Show Volume", value=True)
-                show_confluence = st.sidebar.checkbox("Show Confluence Levels", value=True)
-
-                # Calculate indicators on filtered data
-                if show_ma:
-                    filtered_hist["MA20"] = filtered_hist["Close"].rolling(window=20).mean()
-                    filtered_hist["MA50"] = filtered_hist["Close"].rolling(window=50).mean()
-                if show_bb:
-                    filtered_hist = calculate_bollinger_bands(filtered_hist)
-                if show_rsi:
-                    filtered_hist = calculate_rsi(filtered_hist)
-                if show_macd:
-                    filtered_hist = calculate_macd(filtered_hist)
-                if show_confluence:
-                    confluence_levels = get_confluence_levels(filtered_hist, show_ma, show_bb)
-
-                # ------------------- Price Chart -------------------
-                st.write("### Price Chart with Indicators")
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["Close"], mode="lines", name="Close"))
-                if show_ma:
-                    fig.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["MA20"], mode="lines", name="MA20"))
-                    fig.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["MA50"], mode="lines", name="MA50"))
-                if show_bb:
-                    fig.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["BB_Upper"], mode="lines", name="BB Upper", line=dict(dash="dash")))
-                    fig.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["BB_Lower"], mode="lines", name="BB Lower", line=dict(dash="dash")))
-                if show_confluence:
-                    for level in confluence_levels:
-                        fig.add_hline(y=level, line_dash="dot", line_color="purple", annotation_text=f"Confluence: {level}", annotation_position="top right")
-                st.plotly_chart(fig, use_container_width=True)
-                st.markdown("""
-                **Chart Description:**  
-                - **Day Trading:** Watch breakouts above/below Bollinger Bands.  
-                - **Swing Trading:** Use MA20/MA50 bounces and crossovers.  
-                - **Value Investing:** Consider long-term trends and confluence levels.  
-                """)
-
-                # ------------------- Volume Chart -------------------
-                if show_volume:
-                    st.write("### Volume")
-                    fig_vol = go.Figure()
-                    fig_vol.add_trace(go.Bar(x=filtered_hist.index, y=filtered_hist["Volume"], name="Volume"))
-                    st.plotly_chart(fig_vol, use_container_width=True)
-                    st.markdown("""
-                    **Chart Description:**  
-                    - **Day Trading:** Volume spikes indicate breakout/panic moves.  
-                    - **Swing Trading:** Rising volume confirms trend strength.  
-                    - **Value Investing:** Spikes can show institutional buying/selling.
-                    """)
-
-                # ------------------- RSI Chart -------------------
-                if show_rsi:
-                    st.write("### RSI")
-                    fig_rsi = go.Figure()
-                    fig_rsi.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["RSI"], mode="lines", name="RSI"))
-                    fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-                    fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-                    st.plotly_chart(fig_rsi, use_container_width=True)
-                    st.markdown("""
-                    **Chart Description:**  
-                    - **Day Trading:** Enter/exit when RSI crosses 70/30 zones.  
-                    - **Swing Trading:** Look for divergence to anticipate reversals.  
-                    - **Value Investing:** Oversold RSI may indicate accumulation opportunity.
-                    """)
-
-                # ------------------- MACD Chart -------------------
-                if show_macd:
-                    st.write("### MACD")
-                    fig_macd = go.Figure()
-                    fig_macd.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["MACD"], mode="lines", name="MACD"))
-                    fig_macd.add_trace(go.Scatter(x=filtered_hist.index, y=filtered_hist["Signal"], mode="lines", name="Signal"))
-                    st.plotly_chart(fig_macd, use_container_width=True)
-                    st.markdown("""
-                    **Chart Description:**  
-                    - **Day Trading:** MACD line crossing Signal line signals short-term trade.  
-                    - **Swing Trading:** Confirms medium-term trends; divergence signals reversal.  
-                    - **Value Investing:** Trend direction aids long-term buy/sell decisions.
-                    """)
-
-                # ------------------- Summary Metrics -------------------
-                st.write("### Summary Metrics")
-                st.metric("Start Price", f"${filtered_hist['Close'].iloc[0]:.2f}")
-                st.metric("Current Price", f"${filtered_hist['Close'].iloc[-1]:.2f}")
-                st.metric("High", f"${filtered_hist['High'].max():.2f}")
-                st.metric("Low", f"${filtered_hist['Low'].min():.2f}")
-
-                # ------------------- Download CSV -------------------
-                csv = filtered_hist.to_csv().encode("utf-8")
-                st.download_button(
-                    label="⬇️ Download filtered data as CSV",
-                    data=csv,
-                    file_name=f"{ticker_symbol}_historical_filtered.csv",
-                    mime="text/csv",
-                )
-
-            st.write(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        except Exception as e:
-            st.error(f"Error fetching data: {e}")
+import re
+import random
+import time
+import streamlit as st
+import numpy as np
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from indicators import bollinger, macd, rolling_mean, rsi, summary
+
+# -----------------------
+# Load tickers
+# -----------------------
+TICKER_LINE = re.compile(r"^(.*?)\s*\(([^)]+)\)\s*$")
+
+# cache_resource hands back the same immutable tuple on every rerun instead of
+# unpickling a fresh copy the way cache_data does
+@st.cache_resource(ttl=3600)
+def get_sp500_tickers():
+    try:
+        lines = [line.strip() for line in Path(__file__).with_name("sp500_tickers.txt").read_text().splitlines() if line.strip()]
+        # (display name, ticker symbol) pairs, parsed once instead of on every rerun
+        matches = [(line, TICKER_LINE.match(line)) for line in lines]
+        return tuple((line, m.group(2).strip() if m else line) for line, m in matches)
+    except Exception as e:
+        st.error(f"Error loading tickers: {e}")
+        return ()
+
+# -----------------------
+# Price History
+# -----------------------
+# float32 halves the bytes every indicator, chart and export pass walks; Volume
+# stays int64 since split-adjusted volumes can exceed the int32 range
+PRICE_DTYPES = {column: "float32[pyarrow]" for column in ("Open", "High", "Low", "Close", "Adj Close")}
+
+DOWNLOAD_ATTEMPTS = 3
+RATE_LIMIT_COOLDOWN = 60  # seconds
+
+class RateLimitedError(Exception):
+    pass
+
+@st.cache_resource
+def rate_limit_state():
+    # Shared across sessions: monotonic time until which Yahoo is left alone
+    return {"until": 0.0}
+
+def cooling_down():
+    return time.monotonic() < rate_limit_state()["until"]
+
+def rate_limited(cooldown=True):
+    # The error to raise; a fresh rate limit also starts (or restarts) the cool-down
+    if cooldown:
+        rate_limit_state()["until"] = time.monotonic() + RATE_LIMIT_COOLDOWN
+    return RateLimitedError("Yahoo Finance is rate limiting requests, please try again in a minute.")
+
+def download_history(ticker, start, end, interval):
+    # Ticker.history raises YFRateLimitError on a 429 (always, since yfinance
+    # 0.2.52), which is retried with jittered exponential backoff; any other
+    # failure (delisted, no bars in the range) comes back as an empty frame.
+    # Still rate limited after the last attempt starts the cool-down and
+    # raises, so st.cache_data doesn't cache the failure
+    if cooling_down():
+        raise rate_limited(cooldown=False)
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        if attempt:
+            time.sleep(0.5 * 2 ** (attempt - 1) + random.uniform(0, 0.5))
+        try:
+            hist = yf.Ticker(ticker).history(start=start, end=end, interval=interval, actions=False)
+        except YFRateLimitError:
+            continue
+        # Match yf.download, which drops the exchange timezone from daily bars
+        if not interval.endswith(("m", "h")):
+            hist.index = hist.index.tz_localize(None)
+        return hist
+    raise rate_limited()
+
+@st.cache_resource
+def last_good_history():
+    # Latest successful (frame, fetched_at) per (ticker, interval), served when
+    # a fetch is rate limited
+    return {}
+
+# The fetchers return (frame, fetched_at) so "Last updated" reports when the
+# data was downloaded, which stays fixed while the cached result is reused
+@st.cache_data(ttl=900, show_spinner=False)
+def fetch_history(ticker, start, end, interval="1d"):
+    hist = download_history(ticker, start, end, interval)
+    fetched_at = datetime.now()
+    if hist.empty:
+        return hist, fetched_at
+    # Arrow-backed columns hand st.dataframe its buffers without a numpy->Arrow copy
+    hist = hist.loc[hist["Close"].notna()].convert_dtypes(dtype_backend="pyarrow")
+    hist = hist.astype({column: dtype for column, dtype in PRICE_DTYPES.items() if column in hist})
+    last_good_history()[(ticker, interval)] = (hist, fetched_at)
+    return hist, fetched_at
+
+@st.cache_data(ttl=900, show_spinner=False)
+def fetch_many(tickers, start, end):
+    # yf.download only logs per-ticker failures, so the batch can't tell a 429
+    # from a delisted ticker. Tickers missing from a partial batch are fetched
+    # on their own by get_history; a batch with no data at all is treated as
+    # rate limited
+    batch = yf.download(list(tickers), start=start, end=end, group_by="ticker", threads=True, progress=False)
+    if batch.empty:
+        raise rate_limited()
+    fetched_at = datetime.now()
+    batch = batch.convert_dtypes(dtype_backend="pyarrow")
+    return batch.astype({column: PRICE_DTYPES[column[1]] for column in batch.columns if column[1] in PRICE_DTYPES}), fetched_at
+
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=4)
+
+# A failed prefetch is kept through the cool-down, so reruns during a rate limit
+# don't resubmit the batch, and dropped after it so the next rerun tries again
+@st.cache_resource(ttl=900, max_entries=1, validate=lambda future: not future.done() or future.exception() is None or cooling_down())
+def prefetch_history(tickers, start, end):
+    # Warm the batch cache in the background; the page never waits on it
+    return get_executor().submit(fetch_many, tickers, start, end)
+
+def get_history(ticker, start, end, interval="1d", batch=None):
+    # batch is a (frame, fetched_at) result from fetch_many, which only holds daily bars
+    if batch is not None and interval == "1d" and ticker in batch[0].columns.get_level_values(0):
+        hist = batch[0][ticker]
+        hist = hist.loc[hist["Close"].notna()]
+        # A ticker that failed inside the batch download is fetched on its own
+        if not hist.empty:
+            return hist, batch[1]
+    try:
+        return fetch_history(ticker, start, end, interval)
+    except RateLimitedError:
+        # Fall back to the last data downloaded for this ticker, whatever its range
+        if (ticker, interval) not in last_good_history():
+            raise
+        st.warning("Yahoo Finance is rate limiting requests; showing the last data loaded for this ticker.")
+        return last_good_history()[(ticker, interval)]
+
+# -----------------------
+# Technical Indicators
+# -----------------------
+def calculate_moving_averages(close, short=20, long=50, ma20=None):
+    if ma20 is None:
+        ma20 = rolling_mean(close, short)
+    return {"MA20": ma20, "MA50": rolling_mean(close, long)}
+
+def calculate_rsi(close, window=14):
+    return {"RSI": rsi(close, window)}
+
+def calculate_macd(close, short=12, long=26, signal=9):
+    macd_line, signal_line = macd(close, short, long, signal)
+    return {"MACD": macd_line, "Signal": signal_line}
+
+def calculate_bollinger_bands(close, window=20, num_std=2):
+    ma20, upper, lower = bollinger(close, window, num_std)
+    return {"MA20": ma20, "BB_Upper": upper, "BB_Lower": lower}
+
+def get_confluence_levels(hist, close, show_ma=True, show_bb=True):
+    columns = []
+    if show_ma:
+        columns += ["MA20", "MA50"]
+    if show_bb:
+        columns += ["BB_Upper", "BB_Lower"]
+    last = hist[columns].tail(1).to_numpy(dtype=np.float64, na_value=np.nan).ravel()
+    levels = np.append(last, [close.max(), close.min()])
+    # np.unique rounds, dedupes and sorts in one go; NaN levels (windows longer
+    # than the history) are dropped instead of drawn
+    return np.unique(np.round(levels[~np.isnan(levels)], 2)).tolist()
+
+# Shortest history each chart option produces values for ("ma" draws MA50 too)
+MIN_ROWS = {"ma": 50, "bb": 20, "rsi": 15, "macd": 26}
+
+# Columns each chart option adds to the frame
+INDICATOR_COLUMNS = {
+    "ma": ("MA20", "MA50"),
+    "bb": ("MA20", "BB_Upper", "BB_Lower"),
+    "rsi": ("RSI",),
+    "macd": ("MACD", "Signal"),
+}
+
+@st.cache_data(ttl=900, max_entries=16, show_spinner=False)
+def compute_indicators(close):
+    # Everything is computed once per Close array (keyed on its raw bytes), so
+    # toggling chart options never recomputes, only picks columns from this.
+    # MA20 is the Bollinger middle band, so only MA50 is left for the averages
+    columns = calculate_bollinger_bands(close)
+    columns.update(calculate_moving_averages(close, ma20=columns["MA20"]))
+    columns.update(calculate_rsi(close))
+    columns.update(calculate_macd(close))
+    return columns
+
+@st.cache_data(ttl=900, max_entries=16, show_spinner=False)
+def to_csv_bytes(df):
+    # 7 significant digits is what float32 holds; avoids exporting 187.44000244140625
+    return df.to_csv(float_format="%.7g").encode("utf-8")
+
+# -----------------------
+# Charts
+# -----------------------
+@st.cache_resource(max_entries=16, show_spinner=False)
+def build_price_figure(hist, close, show_ma, show_bb, show_volume, show_rsi, show_macd, show_confluence):
+    # Keyed on the frame's contents and the toggles, so reruns that don't change
+    # either reuse the finished figure. All rows share one x-axis, so the index
+    # is sent to the browser once
+    rows = ["Price"] + (["Volume"] if show_volume else []) + (["RSI"] if show_rsi else []) + (["MACD"] if show_macd else [])
+    row = {name: i + 1 for i, name in enumerate(rows)}
+    fig = make_subplots(
+        rows=len(rows), cols=1, shared_xaxes=True, vertical_spacing=0.05,
+        row_heights=[0.6 if name == "Price" else 0.2 for name in rows], subplot_titles=rows,
+    )
+    # Traces are collected with their row and added in one add_traces call,
+    # so plotly validates and appends them in a single pass
+    traces = [("Price", go.Scattergl(x=hist.index, y=close, mode="lines", name="Close"))]
+    if show_ma:
+        traces.append(("Price", go.Scattergl(x=hist.index, y=hist["MA20"], mode="lines", name="MA20")))
+        traces.append(("Price", go.Scattergl(x=hist.index, y=hist["MA50"], mode="lines", name="MA50")))
+    if show_bb:
+        traces.append(("Price", go.Scattergl(x=hist.index, y=hist["BB_Upper"], mode="lines", name="BB Upper", line=dict(dash="dash"))))
+        traces.append(("Price", go.Scattergl(x=hist.index, y=hist["BB_Lower"], mode="lines", name="BB Lower", line=dict(dash="dash"))))
+    confluence_levels = get_confluence_levels(hist, close, show_ma, show_bb) if show_confluence else []
+    if confluence_levels:
+        # All levels as one trace (segments split by None) plus one batch of labels,
+        # rather than a layout shape and annotation per add_hline call
+        x0, x1 = hist.index[0], hist.index[-1]
+        traces.append(("Price", go.Scattergl(
+            x=[x0, x1, None] * len(confluence_levels),
+            y=[y for level in confluence_levels for y in (level, level, None)],
+            mode="lines", name="Confluence", line=dict(color="purple", dash="dot"), hoverinfo="skip",
+        )))
+    if show_volume:
+        traces.append(("Volume", go.Bar(x=hist.index, y=hist["Volume"], name="Volume")))
+    if show_rsi:
+        traces.append(("RSI", go.Scattergl(x=hist.index, y=hist["RSI"], mode="lines", name="RSI")))
+    if show_macd:
+        traces.append(("MACD", go.Scattergl(x=hist.index, y=hist["MACD"], mode="lines", name="MACD")))
+        traces.append(("MACD", go.Scattergl(x=hist.index, y=hist["Signal"], mode="lines", name="Signal")))
+    fig.add_traces([trace for _, trace in traces], rows=[row[name] for name, _ in traces], cols=1)
+
+    if show_rsi:
+        fig.add_hline(y=70, line_dash="dash", line_color="red", row=row["RSI"], col=1)
+        fig.add_hline(y=30, line_dash="dash", line_color="green", row=row["RSI"], col=1)
+    fig.update_layout(
+        height=450 + 200 * (len(rows) - 1),
+        annotations=list(fig.layout.annotations) + [
+            dict(x=1, xref="x domain", y=level, yref="y", text=f"Confluence: {level}",
+                 showarrow=False, xanchor="right", yanchor="bottom")
+            for level in confluence_levels
+        ],
+    )
+    return fig
+
+@st.fragment
+def render_charts(hist, ticker_symbol):
+    # Toggling an option only reruns this fragment, not the fetch above it
+    st.write("### Chart Options")
+    opt1, opt2, opt3 = st.columns(3)
+    show_ma = opt1.checkbox("Show Moving Averages (MA20 & MA50)", value=True)
+    show_bb = opt1.checkbox("Show Bollinger Bands", value=True)
+    show_rsi = opt2.checkbox("Show RSI", value=True)
+    show_macd = opt2.checkbox("Show MACD", value=True)
+    show_volume = opt3.checkbox("Show Volume", value=True)
+    show_confluence = opt3.checkbox("Show Confluence Levels", value=True)
+
+    # Indicators whose window is longer than the history would come out all-NaN,
+    # so they are skipped rather than computed and drawn as empty traces
+    requested = {"ma": show_ma, "bb": show_bb, "rsi": show_rsi, "macd": show_macd}
+    ready = {name: show and len(hist) >= MIN_ROWS[name] for name, show in requested.items()}
+    skipped = [name.upper() for name, show in requested.items() if show and not ready[name]]
+    if skipped:
+        st.caption(f"Not enough data in the selected range for: {', '.join(skipped)}")
+    show_ma, show_bb, show_rsi, show_macd = ready["ma"], ready["bb"], ready["rsi"], ready["macd"]
+
+    # Close is extracted once as a contiguous float32 array and shared by the
+    # indicator kernels, the confluence levels, the Close trace and the summary
+    close = np.ascontiguousarray(hist["Close"].to_numpy(dtype=np.float32))
+    enabled = [name for name, show in ready.items() if show]
+    if enabled:
+        indicators = compute_indicators(close)
+        # Only the enabled columns are added, in one assign rather than one at a time
+        hist = hist.assign(**{column: indicators[column] for name in enabled for column in INDICATOR_COLUMNS[name]})
+
+    # ------------------- Price / Volume / RSI / MACD Chart -------------------
+    st.write("### Price Chart with Indicators")
+    fig = build_price_figure(hist, close, show_ma, show_bb, show_volume, show_rsi, show_macd, show_confluence)
+    st.plotly_chart(fig, width="stretch")
+    st.markdown("""
+    **Chart Description:**  
+    - **Day Trading:** Watch breakouts above/below Bollinger Bands.  
+    - **Swing Trading:** Use MA20/MA50 bounces and crossovers.  
+    - **Value Investing:** Consider long-term trends and confluence levels.  
+    """)
+    if show_volume:
+        st.markdown("""
+        **Volume:**  
+        - **Day Trading:** Volume spikes indicate breakout/panic moves.  
+        - **Swing Trading:** Rising volume confirms trend strength.  
+        - **Value Investing:** Spikes can show institutional buying/selling.
+        """)
+    if show_rsi:
+        st.markdown("""
+        **RSI:**  
+        - **Day Trading:** Enter/exit when RSI crosses 70/30 zones.  
+        - **Swing Trading:** Look for divergence to anticipate reversals.  
+        - **Value Investing:** Oversold RSI may indicate accumulation opportunity.
+        """)
+    if show_macd:
+        st.markdown("""
+        **MACD:**  
+        - **Day Trading:** MACD line crossing Signal line signals short-term trade.  
+        - **Swing Trading:** Confirms medium-term trends; divergence signals reversal.  
+        - **Value Investing:** Trend direction aids long-term buy/sell decisions.
+        """)
+
+    # ------------------- Summary Metrics -------------------
+    st.write("### Summary Metrics")
+    start_price, current_price, high, low = summary(
+        close,
+        hist["High"].to_numpy(dtype=np.float32, na_value=np.nan),
+        hist["Low"].to_numpy(dtype=np.float32, na_value=np.nan),
+    )
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Start Price", f"${start_price:.2f}")
+    m2.metric("Current Price", f"${current_price:.2f}")
+    # High/Low come back NaN when the column has no values in the range
+    m3.metric("High", f"${high:.2f}" if np.isfinite(high) else "N/A")
+    m4.metric("Low", f"${low:.2f}" if np.isfinite(low) else "N/A")
+
+    # ------------------- Download CSV -------------------
+    # The CSV is only built when the button is clicked, not on every rerun
+    st.download_button(
+        label="⬇️ Download filtered data as CSV",
+        data=lambda: to_csv_bytes(hist),
+        file_name=f"{ticker_symbol}_historical_filtered.csv",
+        mime="text/csv",
+    )
+
+# -----------------------
+# Info Page Content
+# -----------------------
+INFO_MD = """
+Welcome to the S&P 500 Interactive Dashboard! This page explains all the tools and indicators used in the dashboard, with tips for beginners.  
+
+---
+
+### **1. Moving Averages (MA20 & MA50)**
+- **What it is:** The average closing price over 20 or 50 days.  
+- **Purpose:** Identify trend direction and potential reversal points.  
+- **Signals & Tips:**  
+    - Price above MA → bullish trend, below MA → bearish trend.  
+    - MA20 crossing MA50 → short/medium-term trend signal.  
+
+### **2. Bollinger Bands**
+- **What it is:** Bands 2 standard deviations above/below MA20.  
+- **Purpose:** Measure volatility; detect overbought/oversold.  
+- **Signals & Tips:**  
+    - Price near upper band → overbought; lower band → oversold.  
+    - Narrow bands (squeeze) → low volatility, often precedes strong moves.  
+
+### **3. RSI (Relative Strength Index)**
+- **What it is:** Momentum oscillator 0–100.  
+- **Purpose:** Detect overbought (>70) or oversold (<30).  
+- **Signals & Tips:**  
+    - RSI >70 → potential reversal down; RSI <30 → potential reversal up.  
+    - Divergence with price can indicate trend change.  
+
+### **4. MACD**
+- **What it is:** Difference between 12-day & 26-day EMA; signal line = 9-day EMA of MACD.  
+- **Purpose:** Identify trend and momentum.  
+- **Signals & Tips:**  
+    - MACD crosses above Signal → bullish, below → bearish.  
+    - Use with volume and confluence for higher confidence.  
+
+### **5. Volume**
+- **What it is:** Number of shares traded.  
+- **Purpose:** Confirm strength of price moves.  
+- **Signals & Tips:**  
+    - Rising volume confirms trend; spikes may indicate breakouts or reversals.  
+
+### **6. Confluence Levels**
+- **What it is:** Price levels where multiple indicators align (MA, Bollinger Bands, highs/lows).  
+- **Purpose:** Strong support/resistance zones.  
+- **Signals & Tips:**  
+    - Price reaction likely near these levels; more indicators agreeing → stronger level.  
+
+### **7. CSV Download**
+- **Purpose:** Export historical data for further analysis or backtesting.  
+
+---
+
+**General Tips for Beginners:**  
+- Combine multiple indicators for confirmation.  
+- Check trend on larger timeframes before trading short-term.  
+- Zoom and interact with charts; toggle indicators to explore patterns.  
+- Practice on historical data before live trades.
+"""
+
+# -----------------------
+# Streamlit App
+# -----------------------
+st.set_page_config(page_title="S&P 500 Interactive Dashboard", layout="wide")
+st.sidebar.title("Navigation")
+page = st.sidebar.radio("Go to:", ["Dashboard", "Info"])
+
+# Selectbox options, built once as an immutable tuple
+TICKERS = get_sp500_tickers() or (("None", None),)
+
+# -----------------------
+# Information Page
+# -----------------------
+if page == "Info":
+    st.title("ℹ️ Dashboard Information")
+    st.markdown(INFO_MD)
+
+# -----------------------
+# Dashboard
+# -----------------------
+else:
+    st.title("📈 S&P 500 Interactive Dashboard")
+    selected, ticker_symbol = st.selectbox("Select a company:", TICKERS, format_func=lambda x: x[0])
+
+    default_start = date.today() - timedelta(days=365)
+    default_end = date.today()
+
+    if ticker_symbol:
+        # Leave Yahoo alone while a rate limit cools down
+        prefetch = None if cooling_down() else prefetch_history(tuple(symbol for _, symbol in TICKERS), default_start, default_end)
+        try:
+            # Date range
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Start date", default_start)
+            with col2:
+                end_date = st.date_input("End date", default_end)
+
+            st.write(f"Fetching historical data for: {ticker_symbol}")
+            batch = None
+            if (start_date, end_date) == (default_start, default_end) and prefetch is not None and prefetch.done() and prefetch.exception() is None:
+                batch = prefetch.result()
+            with st.spinner("Loading..."):
+                hist, fetched_at = get_history(ticker_symbol, start_date, end_date, batch=batch)
+
+            if hist.empty:
+                st.warning("No historical data available for this ticker in the selected date range.")
+            else:
+                st.subheader(selected)
+
+                # ------------------- Last N Days Table -------------------
+                n_days = 10
+                last_n_days = hist.tail(n_days)
+                st.write(f"### Last {min(n_days, len(hist))} Days of Historical Prices")
+                st.dataframe(last_n_days)
+
+                render_charts(hist, ticker_symbol)
+
+            st.write(f"Last updated: {fetched_at:%Y-%m-%d %H:%M:%S}")
+
+        except RateLimitedError as e:
+            st.warning(str(e))
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
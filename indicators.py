@@ -0,0 +1,146 @@
+import numpy as np
+from numba import njit, types
+
+# These kernels live outside dashboard.py so the compiled dispatchers survive
+# Streamlit reruns (the script body is re-executed, imported modules are not).
+# Outputs take the dtype of the price array (float32 from the dashboard) while
+# the running sums and EMA states stay in float64 scalars.
+#
+# Explicit signatures compile eagerly at import (loaded from the on-disk cache
+# after the first run), so no user interaction pays the JIT cost. fastmath is
+# limited to flags that keep NaN semantics, since outputs are NaN-padded.
+#
+# Inputs are typed as read-only so zero-copy views of Arrow-backed columns are
+# accepted as well as ordinary writable arrays.
+JIT_OPTIONS = dict(cache=True, nogil=True, fastmath={"reassoc", "contract", "arcp"})
+
+def prices(dtype):
+    return types.Array(dtype, 1, "A", readonly=True)
+
+WINDOW_SIGNATURES = [dtype[:](prices(dtype), types.int64) for dtype in (types.float32, types.float64)]
+BAND_SIGNATURES = [
+    types.UniTuple(dtype[:], 3)(prices(dtype), types.int64, types.float64)
+    for dtype in (types.float32, types.float64)
+]
+MACD_SIGNATURES = [
+    types.UniTuple(dtype[:], 2)(prices(dtype), types.int64, types.int64, types.int64)
+    for dtype in (types.float32, types.float64)
+]
+SUMMARY_SIGNATURES = [
+    types.UniTuple(types.float64, 4)(prices(dtype), prices(dtype), prices(dtype))
+    for dtype in (types.float32, types.float64)
+]
+
+# -----------------------
+# Rolling window kernels
+# -----------------------
+@njit(WINDOW_SIGNATURES, **JIT_OPTIONS)
+def rolling_mean(x, window):
+    out = np.full_like(x, np.nan)
+    s = 0.0
+    for i in range(x.size):
+        s += x[i]
+        if i >= window:
+            s -= x[i - window]
+        if i >= window - 1:
+            out[i] = s / window
+    return out
+
+@njit(BAND_SIGNATURES, **JIT_OPTIONS)
+def bollinger(x, window, num_std):
+    # Middle band and sample std (ddof=1) from one set of running sums,
+    # shifted by the first value to keep the sum of squares from cancelling
+    # on large prices
+    mean = np.full_like(x, np.nan)
+    upper = np.full_like(x, np.nan)
+    lower = np.full_like(x, np.nan)
+    if x.size == 0:
+        return mean, upper, lower
+    k = x[0]
+    s = 0.0
+    s2 = 0.0
+    for i in range(x.size):
+        d = x[i] - k
+        s += d
+        s2 += d * d
+        if i >= window:
+            d_old = x[i - window] - k
+            s -= d_old
+            s2 -= d_old * d_old
+        if i >= window - 1:
+            m = k + s / window
+            sd = np.sqrt(max((s2 - s * s / window) / (window - 1), 0.0))
+            mean[i] = m
+            upper[i] = m + num_std * sd
+            lower[i] = m - num_std * sd
+    return mean, upper, lower
+
+# -----------------------
+# Oscillator kernels
+# -----------------------
+@njit(WINDOW_SIGNATURES, **JIT_OPTIONS)
+def rsi(close, window):
+    # Wilder's smoothing (an EMA with alpha = 1/window) of gains and losses,
+    # seeded with their simple mean over the first window
+    out = np.full_like(close, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, close.size):
+        d = close[i] - close[i - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        if i <= window:
+            avg_gain += gain / window
+            avg_loss += loss / window
+        else:
+            avg_gain = (avg_gain * (window - 1) + gain) / window
+            avg_loss = (avg_loss * (window - 1) + loss) / window
+        if i >= window:
+            # No losses at all is 100; a flat run (no gains either) stays NaN
+            if avg_loss > 0:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            elif avg_gain > 0:
+                out[i] = 100.0
+    return out
+
+@njit(MACD_SIGNATURES, **JIT_OPTIONS)
+def macd(close, short, long, signal):
+    # The three EMAs (adjust=False) are carried as scalars in one pass
+    macd_line = np.empty_like(close)
+    signal_line = np.empty_like(close)
+    if close.size == 0:
+        return macd_line, signal_line
+    a_short = 2.0 / (short + 1)
+    a_long = 2.0 / (long + 1)
+    a_signal = 2.0 / (signal + 1)
+    ema_short = close[0]
+    ema_long = close[0]
+    ema_signal = 0.0
+    for i in range(close.size):
+        ema_short = a_short * close[i] + (1.0 - a_short) * ema_short
+        ema_long = a_long * close[i] + (1.0 - a_long) * ema_long
+        m = ema_short - ema_long
+        ema_signal = a_signal * m + (1.0 - a_signal) * ema_signal
+        macd_line[i] = m
+        signal_line[i] = ema_signal
+    return macd_line, signal_line
+
+# -----------------------
+# Summary kernels
+# -----------------------
+@njit(SUMMARY_SIGNATURES, **JIT_OPTIONS)
+def summary(close, high, low):
+    # Start/current close plus period high/low in one pass; NaNs are skipped
+    # like pandas' max()/min(), which also give NaN for an all-NaN column
+    hi = -np.inf
+    lo = np.inf
+    for i in range(high.size):
+        if high[i] > hi:
+            hi = high[i]
+        if low[i] < lo:
+            lo = low[i]
+    if hi == -np.inf:
+        hi = np.nan
+    if lo == np.inf:
+        lo = np.nan
+    return close[0], close[-1], hi, lo